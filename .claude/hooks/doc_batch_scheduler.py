@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware batch scheduler for /doc-batch.
+
+Reads a suite manifest (.claude/docs/suites/<suite-id>/manifest.json),
+orders documents by `documents[].dependencies`, and dispatches each
+document as soon as all of its dependencies have finished, with at most
+`configuration.parallel_limit` documents in flight. Unlike level-by-level
+batching, a fast document never waits for the slowest document on its
+level.
+
+Behavior:
+    - Dependency cycles and unknown dependencies are rejected before any
+      work starts.
+    - With `configuration.continue_on_error`, a failed document's
+      descendants are skipped and independent documents keep running;
+      otherwise no new work is dispatched after the first failure.
+    - After every successful document, progress is checkpointed
+      atomically (temp file + os.replace) to .batch-state.json next to
+      the manifest, keyed by operation and run id, so an interrupted
+      batch resumes from where it stopped. The lifecycle `status` in
+      manifest.json is only written by operations that advance it; the
+      local checks below never do.
+    - Ready documents are dispatched longest-remaining-path first, using
+      `documents[].estimate_seconds` where present and --estimate
+      otherwise.
+    - --dry-run prints the dispatch plan, the critical path, and the
+      expected makespan versus level batching, without running anything.
+
+This is a command-line helper invoked by /doc-batch, not a Claude Code
+hook; it is not registered in settings.json.
+
+Usage:
+    python3 .claude/hooks/doc_batch_scheduler.py <suite-id|manifest.json>
+        [--operation validate|lint] [--parallel N]
+        [--continue-on-error | --stop-on-error] [--no-resume]
+        [--dry-run] [--estimate SECONDS]
+
+Local operations run on a process pool:
+    validate  Run doc_pre_write.py and doc_post_write.py (forbidden
+              patterns, terminology, header hierarchy, internal links)
+              on the generated document; pre-write blocks and post-write
+              consistency issues fail the document
+    lint      Run markdownlint on the generated document
+
+Exit codes: 0 all documents succeeded, 1 a document failed or was not
+run, 2 the manifest is invalid.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from functools import partial
+
+BATCH_STATE_FILE = ".batch-state.json"
+
+# Post-write feedback lines that report consistency issues rather than
+# suggestions; these fail the validate operation.
+POST_WRITE_ISSUE_MARKERS = ("Broken link", "instead of", "Header hierarchy skipped")
+
+
+class ManifestError(Exception):
+    """The manifest cannot be scheduled (duplicate or unknown doc_ids)."""
+
+
+class DependencyCycleError(ManifestError):
+    """The dependency graph contains a cycle."""
+
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__("Dependency cycle: " + " -> ".join(cycle))
+
+
+# ---------------------------------------------------------------------
+# Manifest I/O
+# ---------------------------------------------------------------------
+
+def utc_now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def resolve_manifest(target, project_dir):
+    """Accept a manifest path or a suite id."""
+    if target.endswith(".json") or os.path.sep in target:
+        return os.path.abspath(target)
+    return os.path.join(project_dir, ".claude", "docs", "suites", target, "manifest.json")
+
+
+def load_manifest(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_json_atomic(path, data):
+    """Write JSON atomically so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-batch-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+# ---------------------------------------------------------------------
+# Dependency graph
+# ---------------------------------------------------------------------
+
+def build_graph(documents):
+    """Return (dependencies, dependents) keyed by doc_id, in manifest order."""
+    dependencies = {}
+    for doc in documents:
+        doc_id = doc["doc_id"]
+        if doc_id in dependencies:
+            raise ManifestError(f"Duplicate doc_id: {doc_id}")
+        dependencies[doc_id] = list(doc.get("dependencies") or [])
+
+    dependents = {doc_id: [] for doc_id in dependencies}
+    for doc_id, deps in dependencies.items():
+        for dep in deps:
+            if dep not in dependencies:
+                raise ManifestError(f"{doc_id} depends on unknown doc_id: {dep}")
+            dependents[dep].append(doc_id)
+    return dependencies, dependents
+
+
+def find_cycle(dependencies, candidates):
+    """Return one dependency cycle among `candidates` as a closed path."""
+    state = {}
+    for start in (doc_id for doc_id in dependencies if doc_id in candidates):
+        if start in state:
+            continue
+        stack = [(start, iter(dependencies[start]))]
+        path = [start]
+        state[start] = "active"
+        while stack:
+            node, deps = stack[-1]
+            for dep in deps:
+                if dep not in candidates:
+                    continue
+                if state.get(dep) == "active":
+                    return path[path.index(dep):] + [dep]
+                if dep not in state:
+                    state[dep] = "active"
+                    stack.append((dep, iter(dependencies[dep])))
+                    path.append(dep)
+                    break
+            else:
+                state[node] = "done"
+                stack.pop()
+                path.pop()
+    return []
+
+
+def topological_order(documents):
+    """Kahn's algorithm, stable in manifest order; raises on cycles."""
+    dependencies, dependents = build_graph(documents)
+    remaining = {doc_id: len(deps) for doc_id, deps in dependencies.items()}
+    ready = [doc_id for doc_id, count in remaining.items() if count == 0]
+    order = []
+    while ready:
+        doc_id = ready.pop(0)
+        order.append(doc_id)
+        for child in dependents[doc_id]:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                ready.append(child)
+    if len(order) != len(dependencies):
+        unresolved = {doc_id for doc_id in dependencies if doc_id not in set(order)}
+        raise DependencyCycleError(find_cycle(dependencies, unresolved))
+    return order
+
+
+def descendants(dependents, doc_id):
+    found = set()
+    stack = list(dependents[doc_id])
+    while stack:
+        child = stack.pop()
+        if child not in found:
+            found.add(child)
+            stack.extend(dependents[child])
+    return found
+
+
+def priorities(documents, durations):
+    """Longest remaining path (including the document itself) per doc_id."""
+    order = topological_order(documents)
+    _, dependents = build_graph(documents)
+    rank = {}
+    for doc_id in reversed(order):
+        tail = max((rank[child] for child in dependents[doc_id]), default=0.0)
+        rank[doc_id] = durations[doc_id] + tail
+    return rank
+
+
+# ---------------------------------------------------------------------
+# Dry-run planning
+# ---------------------------------------------------------------------
+
+def critical_path(documents, durations):
+    """Return (path, length) of the longest dependency chain."""
+    order = topological_order(documents)
+    dependencies, _ = build_graph(documents)
+    finish = {}
+    previous = {}
+    for doc_id in order:
+        start = 0.0
+        for dep in dependencies[doc_id]:
+            if finish[dep] > start:
+                start = finish[dep]
+                previous[doc_id] = dep
+        finish[doc_id] = start + durations[doc_id]
+    if not finish:
+        return [], 0.0
+    end = max(order, key=lambda doc_id: finish[doc_id])
+    path = [end]
+    while path[-1] in previous:
+        path.append(previous[path[-1]])
+    return list(reversed(path)), finish[end]
+
+
+def simulate(documents, durations, parallel_limit):
+    """Simulate ready-as-soon-as-possible dispatch; return (schedule, makespan).
+
+    schedule is a list of (doc_id, start, finish) in dispatch order, using
+    the same priority rule as run_batch().
+    """
+    dependencies, dependents = build_graph(documents)
+    rank = priorities(documents, durations)
+    index = {doc["doc_id"]: i for i, doc in enumerate(documents)}
+    remaining = {doc_id: len(deps) for doc_id, deps in dependencies.items()}
+    ready = [doc_id for doc_id, count in remaining.items() if count == 0]
+    running = []
+    schedule = []
+    clock = 0.0
+    while ready or running:
+        ready.sort(key=lambda doc_id: (-rank[doc_id], index[doc_id]))
+        while ready and len(running) < parallel_limit:
+            doc_id = ready.pop(0)
+            running.append((clock + durations[doc_id], doc_id))
+            schedule.append((doc_id, clock, clock + durations[doc_id]))
+        running.sort()
+        clock, doc_id = running.pop(0)
+        for child in dependents[doc_id]:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                ready.append(child)
+    return schedule, clock
+
+
+def level_makespan(documents, durations, parallel_limit):
+    """Makespan of level-by-level batching, for comparison."""
+    dependencies, _ = build_graph(documents)
+    level = {}
+    for doc_id in topological_order(documents):
+        level[doc_id] = 1 + max((level[dep] for dep in dependencies[doc_id]), default=-1)
+    total = 0.0
+    for current in sorted(set(level.values())):
+        members = sorted((durations[d] for d in level if level[d] == current), reverse=True)
+        for i in range(0, len(members), parallel_limit):
+            total += members[i]
+    return total
+
+
+def document_durations(documents, default):
+    """Per-document duration estimates: `estimate_seconds`, else `default`."""
+    durations = {}
+    for doc in documents:
+        estimate = doc.get("estimate_seconds")
+        valid = isinstance(estimate, (int, float)) and not isinstance(estimate, bool)
+        durations[doc["doc_id"]] = float(estimate) if valid and estimate > 0 else default
+    return durations
+
+
+def print_plan(manifest, durations, parallel_limit, done, operation):
+    documents = manifest.get("documents", [])
+    pending = [doc for doc in documents if doc["doc_id"] not in done]
+    # Documents finished earlier in an interrupted run satisfy their dependents.
+    plan_docs = [
+        dict(doc, dependencies=[d for d in doc.get("dependencies") or [] if d not in done])
+        for doc in pending
+    ]
+    print(f"Suite: {manifest.get('suite_id', '?')}  operation: {operation}  "
+          f"documents: {len(documents)}  to run: {len(plan_docs)}  "
+          f"resumed: {len(done)}  parallel_limit: {parallel_limit}")
+    if not plan_docs:
+        print("Nothing to run.")
+        return
+    schedule, makespan = simulate(plan_docs, durations, parallel_limit)
+    path, length = critical_path(plan_docs, durations)
+    print("")
+    print("Dispatch plan (start -> finish, seconds):")
+    for doc_id, start, finish in schedule:
+        print(f"  {start:8.1f} -> {finish:8.1f}  {doc_id}")
+    print("")
+    print(f"Critical path ({length:.1f}s): " + " -> ".join(path))
+    print(f"Expected makespan: {makespan:.1f}s "
+          f"(level batching: {level_makespan(plan_docs, durations, parallel_limit):.1f}s, "
+          f"serial: {sum(durations[d['doc_id']] for d in plan_docs):.1f}s)")
+
+
+# ---------------------------------------------------------------------
+# Batch state
+# ---------------------------------------------------------------------
+# Resume progress lives next to the manifest in .batch-state.json, keyed
+# by operation, so running a check over a suite never touches the
+# documents' lifecycle `status`:
+#
+#   {"validate": {"run_id": "...", "started": "...", "finished": null,
+#                 "completed": {"<doc_id>": "<timestamp>"}}}
+#
+# A run that ends with every document succeeded is marked finished; the
+# next invocation of that operation starts a new run.
+
+def state_path(manifest_path):
+    return os.path.join(os.path.dirname(os.path.abspath(manifest_path)), BATCH_STATE_FILE)
+
+
+def load_state(manifest_path):
+    try:
+        with open(state_path(manifest_path)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def resumable_run(state, operation):
+    """Return the unfinished run for `operation`, or None."""
+    run = state.get(operation)
+    if run and not run.get("finished"):
+        return run
+    return None
+
+
+# ---------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------
+
+def run_batch(manifest_path, task, operation, parallel_limit=None, continue_on_error=None,
+              executor=None, resume=True, success_status=None, log=print):
+    """Run `task(document)` for every document in dependency order.
+
+    `task` must return (ok, detail). When `executor` is None a
+    ProcessPoolExecutor sized to parallel_limit is used, so `task` must be
+    picklable. Progress is checkpointed to .batch-state.json under
+    `operation`; with `resume`, documents completed by an unfinished run
+    of the same operation are not repeated. Document `status` and
+    `last_modified` are written only when `success_status` is given, for
+    operations that advance the document lifecycle.
+
+    Returns a dict with run_id and doc_id lists: completed, failed,
+    skipped (descendants of a failure), not_run (stopped by a failure
+    without continue_on_error) and resumed.
+    """
+    manifest = load_manifest(manifest_path)
+    documents = manifest.get("documents", [])
+    configuration = manifest.get("configuration", {})
+    if parallel_limit is None:
+        parallel_limit = int(configuration.get("parallel_limit") or 1)
+    if continue_on_error is None:
+        continue_on_error = bool(configuration.get("continue_on_error", False))
+    parallel_limit = max(1, parallel_limit)
+
+    dependencies, dependents = build_graph(documents)
+    topological_order(documents)
+    by_id = {doc["doc_id"]: doc for doc in documents}
+    index = {doc["doc_id"]: i for i, doc in enumerate(documents)}
+    rank = priorities(documents, document_durations(documents, 1.0))
+
+    state = load_state(manifest_path)
+    run = resumable_run(state, operation) if resume else None
+    if run is None:
+        run = {"run_id": f"{utc_now()}-{uuid.uuid4().hex[:8]}", "started": utc_now(),
+               "finished": None, "completed": {}}
+    state[operation] = run
+    done = {doc_id for doc_id in run["completed"] if doc_id in by_id}
+
+    result = {"run_id": run["run_id"], "completed": [], "failed": [], "skipped": [],
+              "not_run": [], "resumed": sorted(done, key=index.get)}
+    blocked = set()
+    stopped = False
+    remaining = {doc_id: sum(1 for dep in deps if dep not in done)
+                 for doc_id, deps in dependencies.items() if doc_id not in done}
+    ready = [doc_id for doc_id, count in remaining.items() if count == 0]
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=parallel_limit)
+    in_flight = {}
+    try:
+        while ready or in_flight:
+            ready.sort(key=lambda doc_id: (-rank[doc_id], index[doc_id]))
+            while ready and not stopped and len(in_flight) < parallel_limit:
+                doc_id = ready.pop(0)
+                log(f"[START] {doc_id}")
+                in_flight[executor.submit(task, by_id[doc_id])] = doc_id
+            if not in_flight:
+                break
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                doc_id = in_flight.pop(future)
+                try:
+                    ok, detail = future.result()
+                except Exception as e:
+                    ok, detail = False, f"{type(e).__name__}: {e}"
+
+                if ok:
+                    now = utc_now()
+                    run["completed"][doc_id] = now
+                    write_json_atomic(state_path(manifest_path), state)
+                    if success_status:
+                        by_id[doc_id]["status"] = success_status
+                        by_id[doc_id]["last_modified"] = now
+                        manifest["last_updated"] = now
+                        write_json_atomic(manifest_path, manifest)
+                    result["completed"].append(doc_id)
+                    log(f"[DONE ] {doc_id}")
+                    for child in dependents[doc_id]:
+                        if child in remaining and child not in blocked:
+                            remaining[child] -= 1
+                            if remaining[child] == 0:
+                                ready.append(child)
+                else:
+                    result["failed"].append(doc_id)
+                    log(f"[FAIL ] {doc_id}: {detail}")
+                    if continue_on_error:
+                        for child in sorted(descendants(dependents, doc_id) - done,
+                                            key=index.get):
+                            if child not in blocked:
+                                blocked.add(child)
+                                result["skipped"].append(child)
+                                log(f"[SKIP ] {child}: depends on failed {doc_id}")
+                    else:
+                        stopped = True
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+
+    finished_ids = set(result["completed"]) | set(result["failed"]) | blocked | done
+    result["not_run"] = [doc_id for doc_id in by_id if doc_id not in finished_ids]
+    if not (result["failed"] or result["skipped"] or result["not_run"]):
+        run["finished"] = utc_now()
+    write_json_atomic(state_path(manifest_path), state)
+    return result
+
+
+def _run_hook(project_dir, hook_name, tool_input):
+    env = dict(os.environ)
+    env["CLAUDE_PROJECT_DIR"] = project_dir
+    env["CLAUDE_TOOL_INPUT"] = json.dumps(tool_input)
+    hook_path = os.path.join(project_dir, ".claude", "hooks", hook_name)
+    proc = subprocess.run([sys.executable, hook_path], env=env, cwd=project_dir,
+                          capture_output=True, text=True)
+    output = {}
+    if proc.stdout.strip():
+        try:
+            output = json.loads(proc.stdout)
+        except json.JSONDecodeError:
+            return proc.returncode, {"continue": False, "feedback": proc.stdout.strip()}
+    return proc.returncode, output
+
+
+def _read_output(project_dir, document):
+    path = os.path.join(project_dir, document.get("output_path") or "")
+    if not document.get("output_path") or not os.path.isfile(path):
+        return path, None
+    with open(path) as f:
+        return path, f.read()
+
+
+def validate_document(project_dir, document):
+    """Run the pre-write and post-write hooks on a generated document.
+
+    Fails when pre-write blocks, either hook errors, or post-write
+    feedback reports a consistency issue (broken link, terminology,
+    header hierarchy). Post-write suggestions such as planned suite
+    siblings do not fail the document.
+    """
+    path, content = _read_output(project_dir, document)
+    if content is None:
+        return False, f"output not generated: {document.get('output_path')}"
+    tool_input = {"file_path": path, "content": content}
+    for hook_name in ("doc_pre_write.py", "doc_post_write.py"):
+        rc, output = _run_hook(project_dir, hook_name, tool_input)
+        feedback = output.get("feedback") or ""
+        if rc != 0 or output.get("continue") is False:
+            first_line = (feedback or f"exit {rc}").splitlines()[0]
+            return False, f"{hook_name}: {first_line}"
+        issues = [line.strip() for line in feedback.splitlines()
+                  if any(marker in line for marker in POST_WRITE_ISSUE_MARKERS)]
+        if hook_name == "doc_post_write.py" and issues:
+            return False, f"{hook_name}: {len(issues)} issue(s): {issues[0]}"
+    return True, ""
+
+
+def lint_document(project_dir, document):
+    """Run markdownlint on a generated document."""
+    path, content = _read_output(project_dir, document)
+    if content is None:
+        return False, f"output not generated: {document.get('output_path')}"
+    proc = subprocess.run(["npx", "--no-install", "markdownlint", path],
+                          cwd=project_dir, capture_output=True, text=True)
+    if proc.returncode != 0:
+        lines = (proc.stdout + proc.stderr).strip().splitlines()
+        return False, lines[0] if lines else f"markdownlint exit {proc.returncode}"
+    return True, ""
+
+
+# Local checks only; none of them advances the document lifecycle, so
+# none of them writes `status`.
+OPERATIONS = {
+    "validate": validate_document,
+    "lint": lint_document,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dependency-aware /doc-batch scheduler.")
+    parser.add_argument("suite", help="Suite id or path to manifest.json")
+    parser.add_argument("--operation", choices=sorted(OPERATIONS), default="validate")
+    parser.add_argument("--parallel", type=int,
+                        help="Override configuration.parallel_limit")
+    errors = parser.add_mutually_exclusive_group()
+    errors.add_argument("--continue-on-error", dest="continue_on_error",
+                        action="store_true", default=None)
+    errors.add_argument("--stop-on-error", dest="continue_on_error", action="store_false")
+    parser.add_argument("--no-resume", dest="resume", action="store_false",
+                        help="Start a new run instead of resuming an unfinished one")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the plan, critical path and makespan; run nothing")
+    parser.add_argument("--estimate", type=float, default=1.0,
+                        help="Seconds per document without estimate_seconds (default: 1.0)")
+    args = parser.parse_args(argv)
+
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
+    manifest_path = resolve_manifest(args.suite, project_dir)
+    try:
+        manifest = load_manifest(manifest_path)
+        documents = manifest.get("documents", [])
+        topological_order(documents)
+    except (OSError, json.JSONDecodeError, ManifestError) as e:
+        print(f"Cannot schedule {manifest_path}: {e}", file=sys.stderr)
+        return 2
+
+    parallel_limit = max(1, args.parallel or
+                         int(manifest.get("configuration", {}).get("parallel_limit") or 1))
+
+    if args.dry_run:
+        run = resumable_run(load_state(manifest_path), args.operation) if args.resume else None
+        done = set(run["completed"]) if run else set()
+        durations = document_durations(documents, args.estimate)
+        print_plan(manifest, durations, parallel_limit, done, args.operation)
+        return 0
+
+    task = partial(OPERATIONS[args.operation], project_dir)
+    result = run_batch(manifest_path, task, args.operation, parallel_limit=parallel_limit,
+                       continue_on_error=args.continue_on_error, resume=args.resume)
+    print("")
+    print(f"Run {result['run_id']}: "
+          f"Completed: {len(result['completed'])}  Failed: {len(result['failed'])}  "
+          f"Skipped: {len(result['skipped'])}  Not run: {len(result['not_run'])}  "
+          f"Resumed: {len(result['resumed'])}")
+    return 1 if result["failed"] or result["skipped"] or result["not_run"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
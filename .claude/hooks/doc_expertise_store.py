@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""
+Optional SQLite-backed store for the expertise files.
+
+Imports .claude/docs/expertise/patterns.json and anti-patterns.json into
+a SQLite database (.claude/docs/expertise/expertise.db) so that /doc-improve
+and the writers can query and update expertise without reparsing and
+rewriting the whole JSON file on every change. The JSON files stay the
+tracked source of truth; `export` writes them back.
+
+Behavior:
+    - Entries are indexed by category and document type. A pattern's
+      document type is its `doc_type` field when present, otherwise the
+      first of api/design/manual named in its category
+      ("api-documentation" -> api); categories that name none apply to
+      every document type.
+    - Score updates are single UPDATE statements inside BEGIN IMMEDIATE
+      transactions, so concurrent batch writers never lose an update:
+      +0.02 per successful use, -0.05 per failure, clamped to 0.50-0.99,
+      and usage_count +1 either way. Anti-pattern hits increment
+      occurrence_count the same way.
+    - Export round-trips exactly: the top-level structure, key order,
+      number literals ("0.90") and indentation of the imported file are
+      kept, and only the counters that changed are rewritten. Import
+      refuses a file whose layout it cannot reproduce byte for byte, and
+      refuses to overwrite updates that have not been exported yet;
+      export refuses to overwrite a file edited since it was imported
+      (--force overrides either).
+    - All anti-pattern `detection_pattern` regexes are compiled into one
+      scanner that finds every match in a single pass. Patterns that
+      cannot share a combined regex (own named groups, backreferences,
+      verbose or locale flags) are scanned individually; invalid regexes
+      are reported and skipped.
+
+This is a command-line helper for /doc-improve and the writer agents,
+not a Claude Code hook; it is not registered in settings.json.
+
+Usage:
+    python3 .claude/hooks/doc_expertise_store.py import [--force]
+    python3 .claude/hooks/doc_expertise_store.py export [--force]
+    python3 .claude/hooks/doc_expertise_store.py top <doc-type> [-n N] [--json]
+    python3 .claude/hooks/doc_expertise_store.py record <pattern-id> --success|--failure
+    python3 .claude/hooks/doc_expertise_store.py scan <file> [--doc-type T]
+        [--record] [--json]
+
+Exit codes: 0 success, 1 scan found anti-patterns, 2 the store or an
+expertise file is invalid.
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+EXPERTISE_DIR = os.path.join(".claude", "docs", "expertise")
+DB_FILE = "expertise.db"
+FILES = {
+    "patterns": "patterns.json",
+    "anti-patterns": "anti-patterns.json",
+}
+
+DEFAULT_SCORE = 0.85
+SUCCESS_DELTA = 0.02
+FAILURE_DELTA = -0.05
+MIN_SCORE = 0.50
+MAX_SCORE = 0.99
+
+# Counters the store updates, with the value assumed when an entry omits
+# the field.
+TRACKED_FIELDS = {
+    "patterns": (("effectiveness_score", DEFAULT_SCORE), ("usage_count", 0)),
+    "anti-patterns": (("occurrence_count", 0),),
+}
+
+# Category words that tie an entry to one /doc-plan --type.
+DOC_TYPE_TOKENS = {
+    "api": "api",
+    "design": "design",
+    "architecture": "design",
+    "manual": "manual",
+    "guide": "manual",
+    "tutorial": "manual",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    kind TEXT PRIMARY KEY,
+    skeleton TEXT NOT NULL,
+    layout TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    imported TEXT NOT NULL,
+    dirty INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    list_path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    doc_type TEXT NOT NULL,
+    effectiveness_score REAL,
+    usage_count INTEGER,
+    occurrence_count INTEGER,
+    body TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE INDEX IF NOT EXISTS entries_by_category ON entries (kind, category);
+CREATE INDEX IF NOT EXISTS entries_by_doc_type
+    ON entries (kind, doc_type, effectiveness_score DESC);
+"""
+
+
+class ExpertiseError(Exception):
+    """An expertise file or the store cannot be used as requested."""
+
+
+def utc_now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def write_text_atomic(path, text):
+    """Write text atomically so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-expertise-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+# ---------------------------------------------------------------------
+# Exact JSON round-trip
+# ---------------------------------------------------------------------
+
+class JsonFloat(float):
+    """A float that remembers the literal it was parsed from."""
+
+    def __new__(cls, literal):
+        value = super().__new__(cls, literal)
+        value.literal = literal
+        return value
+
+
+def loads(text):
+    """Parse JSON keeping key order and number literals."""
+    return json.loads(text, parse_float=JsonFloat)
+
+
+# Layouts tried on import; the first that reproduces the file is kept.
+# The first entry matches JSON.stringify(value, null, 2).
+LAYOUTS = [
+    {"indent": indent, "separators": separators, "ensure_ascii": ensure_ascii}
+    for indent, separators in (("  ", (",", ": ")), ("    ", (",", ": ")),
+                               ("\t", (",", ": ")), (None, (", ", ": ")),
+                               (None, (",", ":")))
+    for ensure_ascii in (False, True)
+]
+COMPACT = {"indent": None, "separators": (",", ":"), "ensure_ascii": False}
+
+
+def dumps(value, layout, level=0):
+    """Serialize like json.dumps(..., indent=...), keeping number literals."""
+    if isinstance(value, dict):
+        items = [json.dumps(key, ensure_ascii=layout["ensure_ascii"]) + layout["separators"][1]
+                 + dumps(item, layout, level + 1) for key, item in value.items()]
+        return _container("{", items, "}", layout, level)
+    if isinstance(value, list):
+        items = [dumps(item, layout, level + 1) for item in value]
+        return _container("[", items, "]", layout, level)
+    if isinstance(value, JsonFloat):
+        return value.literal
+    if isinstance(value, float):
+        return float.__repr__(value)
+    return json.dumps(value, ensure_ascii=layout["ensure_ascii"])
+
+
+def _container(open_, items, close, layout, level):
+    if not items:
+        return open_ + close
+    indent = layout["indent"]
+    if indent is None:
+        return open_ + layout["separators"][0].join(items) + close
+    inner = "\n" + indent * (level + 1)
+    return open_ + inner + ("," + inner).join(items) + "\n" + indent * level + close
+
+
+def detect_layout(text, document):
+    """Return the layout that reproduces `text` exactly, or None."""
+    newline = text.endswith("\n")
+    for layout in LAYOUTS:
+        if dumps(document, layout) + ("\n" if newline else "") == text:
+            return dict(layout, newline=newline)
+    return None
+
+
+def entry_lists(node, path=()):
+    """Yield (path, list) for every list whose items are all entries with an id."""
+    if isinstance(node, list):
+        if node and all(isinstance(item, dict) and "id" in item for item in node):
+            yield path, node
+            return
+        for index, item in enumerate(node):
+            yield from entry_lists(item, path + (index,))
+    elif isinstance(node, dict):
+        for key, item in node.items():
+            yield from entry_lists(item, path + (key,))
+
+
+def _number(value, original):
+    """Format an updated counter like the literal it replaces."""
+    if isinstance(value, float) or isinstance(original, float):
+        decimals = 2
+        if isinstance(original, JsonFloat) and "." in original.literal:
+            decimals = max(decimals, len(original.literal.split(".")[1]))
+        return JsonFloat(f"{value:.{decimals}f}")
+    return int(value)
+
+
+def doc_type_for(entry):
+    """Return the document type an entry applies to ("" for every type)."""
+    explicit = entry.get("doc_type") or entry.get("document_type")
+    if isinstance(explicit, str) and explicit:
+        return explicit
+    for token in re.split(r"[^a-z]+", str(entry.get("category") or "").lower()):
+        if token in DOC_TYPE_TOKENS:
+            return DOC_TYPE_TOKENS[token]
+    return ""
+
+
+# ---------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------
+
+def digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def connect(db_path):
+    """Open (and create) the store; WAL lets readers run during writes."""
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+@contextmanager
+def transaction(conn):
+    """Take the write lock up front so read-modify-write never interleaves."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def import_file(conn, kind, path, force=False):
+    """Replace the stored `kind` entries with the contents of `path`.
+
+    Returns the number of entries imported.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        text = f.read()
+    try:
+        document = loads(text)
+    except json.JSONDecodeError as e:
+        raise ExpertiseError(f"{path}: {e}")
+    layout = detect_layout(text, document)
+    if layout is None:
+        raise ExpertiseError(
+            f"{path}: layout cannot be reproduced exactly (duplicate keys or custom "
+            "formatting); reformat it with JSON.stringify(data, null, 2) first")
+
+    rows = []
+    position = 0
+    for list_path, entries in list(entry_lists(document)):
+        for entry in entries:
+            for field, _ in TRACKED_FIELDS[kind]:
+                value = entry.get(field, 0)
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ExpertiseError(f"{path}: {entry['id']}: {field} is not a number")
+            rows.append((kind, str(entry["id"]), json.dumps(list_path), position,
+                         str(entry.get("category") or ""), doc_type_for(entry),
+                         entry.get("effectiveness_score", DEFAULT_SCORE),
+                         entry.get("usage_count", 0), entry.get("occurrence_count", 0),
+                         dumps(entry, COMPACT)))
+            position += 1
+        if list_path:
+            parent = document
+            for key in list_path[:-1]:
+                parent = parent[key]
+            parent[list_path[-1]] = []
+        else:
+            document = []
+
+    with transaction(conn):
+        row = conn.execute("SELECT dirty FROM files WHERE kind = ?", (kind,)).fetchone()
+        if row and row[0] and not force:
+            raise ExpertiseError(
+                f"{FILES[kind]} has updates that were not exported; "
+                "run export first or import with --force")
+        conn.execute("DELETE FROM entries WHERE kind = ?", (kind,))
+        try:
+            conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.IntegrityError:
+            ids = [r[1] for r in rows]
+            duplicates = sorted({i for i in ids if ids.count(i) > 1})
+            raise ExpertiseError(f"{path}: duplicate id: {', '.join(duplicates)}")
+        conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, 0)",
+                     (kind, dumps(document, COMPACT), json.dumps(layout), digest(text),
+                      utc_now()))
+        if render(conn, kind) != text:
+            raise ExpertiseError(f"{path}: export would not reproduce the file exactly")
+    return len(rows)
+
+
+def _current_entry(kind, body, values):
+    """Return an entry with the stored counters applied where they changed."""
+    entry = loads(body)
+    for (field, default), value in zip(TRACKED_FIELDS[kind], values):
+        original = entry.get(field, default)
+        if value is not None and abs(value - original) > 1e-9:
+            entry[field] = _number(value, original)
+    return entry
+
+
+def _tracked_columns(kind):
+    return ", ".join(field for field, _ in TRACKED_FIELDS[kind])
+
+
+def render(conn, kind):
+    """Return the JSON text for `kind` as it stands in the store."""
+    row = conn.execute("SELECT skeleton, layout FROM files WHERE kind = ?", (kind,)).fetchone()
+    if row is None:
+        raise ExpertiseError(f"{FILES[kind]} has not been imported")
+    document = loads(row[0])
+    layout = json.loads(row[1])
+    lists = {}
+    for list_path, body, *values in conn.execute(
+            f"SELECT list_path, body, {_tracked_columns(kind)} FROM entries "
+            "WHERE kind = ? ORDER BY position", (kind,)):
+        lists.setdefault(list_path, []).append(_current_entry(kind, body, values))
+    for list_path, entries in lists.items():
+        path = json.loads(list_path)
+        if not path:
+            document = entries
+            continue
+        parent = document
+        for key in path[:-1]:
+            parent = parent[key]
+        parent[path[-1]] = entries
+    return dumps(document, layout) + ("\n" if layout["newline"] else "")
+
+
+def export_file(conn, kind, path, force=False):
+    """Write the stored `kind` entries back to `path` atomically."""
+    with transaction(conn):
+        text = render(conn, kind)
+        if not force and os.path.exists(path):
+            with open(path, encoding="utf-8", newline="") as f:
+                on_disk = digest(f.read())
+            stored = conn.execute("SELECT digest FROM files WHERE kind = ?", (kind,)).fetchone()[0]
+            if on_disk != stored:
+                raise ExpertiseError(
+                    f"{path} changed since it was imported; import it again "
+                    "or export with --force")
+        write_text_atomic(path, text)
+        conn.execute("UPDATE files SET dirty = 0, digest = ? WHERE kind = ?",
+                     (digest(text), kind))
+
+
+def record_use(conn, pattern_id, success):
+    """Apply one use of a pattern; return its new effectiveness_score."""
+    delta = SUCCESS_DELTA if success else FAILURE_DELTA
+    with transaction(conn):
+        cursor = conn.execute(
+            "UPDATE entries SET effectiveness_score = "
+            "MIN(?, MAX(?, ROUND(effectiveness_score + ?, 2))), usage_count = usage_count + 1 "
+            "WHERE kind = 'patterns' AND id = ?",
+            (MAX_SCORE, MIN_SCORE, delta, pattern_id))
+        if cursor.rowcount == 0:
+            raise ExpertiseError(f"Unknown pattern id: {pattern_id}")
+        conn.execute("UPDATE files SET dirty = 1 WHERE kind = 'patterns'")
+        return conn.execute("SELECT effectiveness_score FROM entries "
+                            "WHERE kind = 'patterns' AND id = ?", (pattern_id,)).fetchone()[0]
+
+
+def record_occurrences(conn, anti_pattern_ids):
+    """Count one occurrence of each anti-pattern id."""
+    with transaction(conn):
+        for anti_pattern_id in anti_pattern_ids:
+            conn.execute("UPDATE entries SET occurrence_count = occurrence_count + 1 "
+                         "WHERE kind = 'anti-patterns' AND id = ?", (anti_pattern_id,))
+        conn.execute("UPDATE files SET dirty = 1 WHERE kind = 'anti-patterns'")
+
+
+def top_patterns(conn, doc_type, limit=5):
+    """Return the `limit` most effective patterns that apply to `doc_type`."""
+    rows = conn.execute(
+        f"SELECT body, {_tracked_columns('patterns')} FROM entries "
+        "WHERE kind = 'patterns' AND doc_type IN (?, '') "
+        "ORDER BY effectiveness_score DESC, usage_count DESC, position LIMIT ?",
+        (doc_type, limit))
+    return [_current_entry("patterns", body, values) for body, *values in rows]
+
+
+def anti_patterns(conn, doc_type=None):
+    """Return anti-patterns in file order, optionally only those for `doc_type`."""
+    query = (f"SELECT body, {_tracked_columns('anti-patterns')} FROM entries "
+             "WHERE kind = 'anti-patterns'")
+    params = ()
+    if doc_type is not None:
+        query += " AND doc_type IN (?, '')"
+        params = (doc_type,)
+    rows = conn.execute(query + " ORDER BY position", params)
+    return [_current_entry("anti-patterns", body, values) for body, *values in rows]
+
+
+# ---------------------------------------------------------------------
+# Anti-pattern scanner
+# ---------------------------------------------------------------------
+
+# Constructs whose meaning depends on group numbering or global flags,
+# which change once a regex is embedded in a combined pattern.
+_NOT_COMBINABLE = re.compile(r"\\[1-9]|\(\?\(|\(\?P=")
+_LEADING_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+
+
+def _combinable(source, compiled):
+    """Return `source` rewritten for a combined regex, or None."""
+    if compiled.groupindex or _NOT_COMBINABLE.search(source):
+        return None
+    flags = _LEADING_FLAGS.match(source)
+    if not flags:
+        return source
+    if set(flags.group(1)) <= set("ims"):
+        return f"(?{flags.group(1)}:{source[flags.end():]})"
+    return None
+
+
+class AntiPatternScanner:
+    """Match every anti-pattern `detection_pattern` in one pass.
+
+    Each detector becomes a lookahead branch of one compiled regex, so a
+    clean document is scanned once regardless of how many anti-patterns
+    exist. At a position where a branch matches, the later detectors are
+    tried there too, so overlapping detectors are all reported and each
+    detector yields the same matches as its own re.finditer().
+    """
+
+    def __init__(self, entries):
+        self.skipped = []
+        self._members = []
+        self._fallback = []
+        branches = []
+        for entry in entries:
+            source = entry.get("detection_pattern")
+            if not isinstance(source, str) or not source:
+                self.skipped.append((entry.get("id"), "no detection_pattern"))
+                continue
+            try:
+                compiled = re.compile(source)
+            except re.error as e:
+                self.skipped.append((entry.get("id"), f"invalid regex: {e}"))
+                continue
+            rewritten = _combinable(source, compiled)
+            if rewritten is None:
+                self._fallback.append((entry, compiled))
+                continue
+            branches.append(f"(?=(?P<_ap{len(self._members)}>{rewritten}))")
+            self._members.append((entry, compiled))
+        self._combined = None
+        if branches:
+            try:
+                self._combined = re.compile("|".join(branches))
+            except re.error:
+                self._fallback.extend(self._members)
+                self._members = []
+        self._groups = [f"_ap{index}" for index in range(len(self._members))]
+
+    def scan(self, text):
+        """Return findings ordered by position."""
+        hits = []
+        allowed = [0] * len(self._members)
+
+        def add(index, entry, start, end):
+            hits.append((start, index, entry, text[start:end]))
+
+        if self._combined is not None:
+            for match in self._combined.finditer(text):
+                start = match.start()
+                # Alternation takes the first branch that matches here, so
+                # earlier detectors do not match at this position.
+                first = next(i for i, group in enumerate(self._groups)
+                             if match.start(group) != -1)
+                for index in range(first, len(self._members)):
+                    entry, compiled = self._members[index]
+                    if start < allowed[index]:
+                        continue
+                    if index == first:
+                        end = match.end(self._groups[first])
+                    else:
+                        found = compiled.match(text, start)
+                        if found is None:
+                            continue
+                        end = found.end()
+                    allowed[index] = end if end > start else start + 1
+                    add(index, entry, start, end)
+        for offset, (entry, compiled) in enumerate(self._fallback):
+            for found in compiled.finditer(text):
+                add(len(self._members) + offset, entry, found.start(), found.end())
+
+        line_starts = [0] + [newline.end() for newline in re.finditer("\n", text)] if hits else []
+        findings = []
+        for start, _, entry, matched in sorted(hits, key=lambda hit: hit[:2]):
+            findings.append({
+                "id": entry.get("id"),
+                "category": entry.get("category"),
+                "severity": entry.get("severity"),
+                "line": bisect.bisect_right(line_starts, start),
+                "match": matched,
+                "correction": entry.get("correction"),
+            })
+        return findings
+
+
+# ---------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite-backed expertise store.")
+    parser.add_argument("--expertise-dir", help=f"Default: $CLAUDE_PROJECT_DIR/{EXPERTISE_DIR}")
+    parser.add_argument("--db", help=f"Default: <expertise-dir>/{DB_FILE}")
+    commands = parser.add_subparsers(dest="command", required=True)
+    imports = commands.add_parser("import", help="Load the JSON files into the store")
+    imports.add_argument("--force", action="store_true",
+                         help="Discard updates that were not exported")
+    exports = commands.add_parser("export", help="Write the JSON files from the store")
+    exports.add_argument("--force", action="store_true",
+                         help="Overwrite files edited since they were imported")
+    top = commands.add_parser("top", help="Most effective patterns for a document type")
+    top.add_argument("doc_type")
+    top.add_argument("-n", type=int, default=5)
+    top.add_argument("--json", action="store_true")
+    record = commands.add_parser("record", help="Score one use of a pattern")
+    record.add_argument("pattern_id")
+    outcome = record.add_mutually_exclusive_group(required=True)
+    outcome.add_argument("--success", dest="success", action="store_true")
+    outcome.add_argument("--failure", dest="success", action="store_false")
+    scan = commands.add_parser("scan", help="Check a document against the anti-patterns")
+    scan.add_argument("file")
+    scan.add_argument("--doc-type")
+    scan.add_argument("--record", action="store_true",
+                      help="Count one occurrence of each anti-pattern found")
+    scan.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
+    expertise_dir = args.expertise_dir or os.path.join(project_dir, EXPERTISE_DIR)
+    db_path = args.db or os.path.join(expertise_dir, DB_FILE)
+
+    try:
+        conn = connect(db_path)
+        if args.command == "import":
+            imported = 0
+            for kind, name in FILES.items():
+                path = os.path.join(expertise_dir, name)
+                if os.path.exists(path):
+                    count = import_file(conn, kind, path, force=args.force)
+                    print(f"Imported {count} entries from {name}")
+                    imported += 1
+            if not imported:
+                raise ExpertiseError(f"No expertise files in {expertise_dir}")
+        elif args.command == "export":
+            kinds = [row[0] for row in conn.execute("SELECT kind FROM files ORDER BY kind")]
+            if not kinds:
+                raise ExpertiseError("Nothing imported yet; run import first")
+            for kind in kinds:
+                export_file(conn, kind, os.path.join(expertise_dir, FILES[kind]),
+                            force=args.force)
+                print(f"Exported {FILES[kind]}")
+        elif args.command == "top":
+            patterns = top_patterns(conn, args.doc_type, args.n)
+            if args.json:
+                print(dumps(patterns, LAYOUTS[0]))
+            else:
+                for pattern in patterns:
+                    print(f"{pattern.get('effectiveness_score', DEFAULT_SCORE):.2f}  "
+                          f"{pattern['id']}  [{pattern.get('category', '')}]  "
+                          f"{pattern.get('description', '')}")
+        elif args.command == "record":
+            score = record_use(conn, args.pattern_id, args.success)
+            print(f"{args.pattern_id}: effectiveness_score {score:.2f}")
+        elif args.command == "scan":
+            with open(args.file, encoding="utf-8") as f:
+                text = f.read()
+            scanner = AntiPatternScanner(anti_patterns(conn, args.doc_type))
+            findings = scanner.scan(text)
+            for anti_pattern_id, reason in scanner.skipped:
+                print(f"Skipped anti-pattern {anti_pattern_id}: {reason}", file=sys.stderr)
+            if args.record and findings:
+                record_occurrences(conn, sorted({f["id"] for f in findings}))
+            if args.json:
+                print(json.dumps(findings, indent=2, ensure_ascii=False))
+            else:
+                for finding in findings:
+                    print(f"[{finding['severity']}] {finding['id']} line {finding['line']}: "
+                          f"{finding['match']!r}")
+            return 1 if findings else 0
+    except (OSError, sqlite3.Error, ExpertiseError) as e:
+        print(f"Expertise store: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,736 @@
+#!/usr/bin/env python3
+# tests/bench.py
+# Offline benchmark and scaling harness for spec-driven-docs-system
+#
+# Generates synthetic corpora in a temporary project and measures:
+#   1. Pre-write and post-write hooks vs. document count (throughput)
+#   2. Pre-write and post-write hooks vs. document size (1 KB .. 120 KB)
+#   3. Post-write hook vs. glossary size (consistency-rules.json and
+#      domain-knowledge.json terminology)
+#   4. Post-write link resolution vs. links per document
+#   5. Post-write hook vs. suites per project (planned-sibling lookups)
+#   6. Post-review hook (score parsing and promotion suggestion)
+#   7. Suite manifest JSON Schema validation (requires `jsonschema`;
+#      skipped gracefully if the package or schema is unavailable)
+#
+# Hooks are invoked exactly as Claude Code and tests/smoke.sh invoke them
+# (one python3 process per call, input in CLAUDE_TOOL_INPUT), so numbers
+# include interpreter startup and config loading. Each case reports
+# throughput, p50/p95/p99 latency and peak RSS of the hook processes.
+#
+# Document size is capped at roughly 128 KiB: Linux limits a single
+# environment string (MAX_ARG_STRLEN), and CLAUDE_TOOL_INPUT is the only
+# input channel the hooks are known to read. Larger --sizes are recorded
+# as skipped rather than timed.
+#
+# The synthetic corpora are clean, so a call counts as an error when
+# pre-write blocks or post-write reports a consistency issue (broken
+# link, terminology, header hierarchy); a wrong code path never passes
+# silently.
+#
+# Results are written as JSON to bench_output.txt (git-ignored). Use
+# --compare to diff a run against a baseline file and exit non-zero on
+# regressions. Runs fully offline; no Claude session is needed.
+#
+# Usage:
+#   python3 tests/bench.py                        # quick profile
+#   python3 tests/bench.py --profile full         # full scaling sweep
+#   python3 tests/bench.py --output /tmp/base.json
+#   python3 tests/bench.py --compare /tmp/base.json
+#   python3 tests/bench.py --compare /tmp/base.json --current bench_output.txt
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+FRAMEWORK_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_OUTPUT = os.path.join(FRAMEWORK_ROOT, "bench_output.txt")
+SCHEMA_VERSION = 1
+
+DIMENSIONS = ["doc_count", "doc_size", "glossary", "links", "suites", "post_review", "schema"]
+
+HOOKS = {
+    "pre_write": "doc_pre_write.py",
+    "post_write": "doc_post_write.py",
+    "post_review": "doc_post_review.py",
+}
+
+PROFILES = {
+    "quick": {
+        "doc_counts": [10, 50],
+        "doc_sizes": [1024, 16 * 1024, 64 * 1024],
+        "glossary_terms": [10, 100],
+        "links_per_doc": [0, 20],
+        "suites": [1, 5],
+        "samples": 5,
+    },
+    "full": {
+        "doc_counts": [10, 100, 1000, 5000],
+        "doc_sizes": [1024, 16 * 1024, 64 * 1024, 100 * 1024, 120 * 1024],
+        "glossary_terms": [10, 100, 1000, 5000],
+        "links_per_doc": [0, 10, 100, 500],
+        "suites": [1, 10, 100],
+        "samples": 20,
+    },
+}
+
+# Base size for documents in dimensions that do not scale size.
+BASE_DOC_SIZE = 4 * 1024
+
+# Linux rejects a single environment string larger than MAX_ARG_STRLEN
+# (32 pages). Cases whose tool input would exceed it cannot reach the
+# hooks through CLAUDE_TOOL_INPUT and are recorded as skipped.
+ENV_PAYLOAD_LIMIT = 32 * 4096 - len("CLAUDE_TOOL_INPUT=") - 1
+
+# Post-write feedback that reports a consistency issue rather than a
+# suggestion (planned siblings are suggestions and stay clean).
+POST_WRITE_ISSUE_MARKERS = ("Broken link", "instead of", "Header hierarchy skipped")
+
+# Prose vocabulary uses only preferred terms so synthetic documents pass
+# the terminology and forbidden-pattern checks and measure the clean path.
+SENTENCES = [
+    "The endpoint returns a response for each request it receives.",
+    "Every parameter is validated before the service stores the record.",
+    "Operators authenticate with a scoped token before they call the endpoint.",
+    "The configuration file lives in the repository under the docs directory.",
+    "Each function documents its inputs, outputs, and error conditions.",
+    "Clients should retry a failed request with exponential backoff.",
+    "The service will initialize its cache when the first request arrives.",
+    "Pagination uses an opaque cursor that the response includes.",
+]
+
+CODE_BLOCK = """```python
+def fetch_user(client, user_id: int) -> dict:
+    response = client.get(f"/users/{user_id}")
+    response.raise_for_status()
+    return response.json()
+```"""
+
+
+# ---------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a non-empty list."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies):
+    ms = [value * 1000.0 for value in latencies]
+    return {
+        "p50": round(percentile(ms, 50), 3),
+        "p95": round(percentile(ms, 95), 3),
+        "p99": round(percentile(ms, 99), 3),
+        "max": round(max(ms), 3),
+        "mean": round(sum(ms) / len(ms), 3),
+    }
+
+
+# ---------------------------------------------------------------------
+# Synthetic corpus generation
+# ---------------------------------------------------------------------
+
+def make_document(index, size, links=(), terms=()):
+    """Build a clean Markdown document of roughly `size` bytes."""
+    parts = [f"# Bench document {index:05d}", ""]
+    if terms:
+        glossary = ", ".join(terms)
+        parts += [f"This page uses the project terms {glossary}.", ""]
+    if links:
+        parts += ["## Related documents", ""]
+        parts += [f"- [{label}]({target})" for label, target in links]
+        parts.append("")
+
+    section = 0
+    sentence = index
+    while len("\n".join(parts)) < size:
+        section += 1
+        parts += [f"## Section {section}", ""]
+        paragraph = []
+        for _ in range(6):
+            paragraph.append(SENTENCES[sentence % len(SENTENCES)])
+            sentence += 1
+        parts += [" ".join(paragraph), ""]
+        if section % 4 == 0:
+            parts += [CODE_BLOCK, ""]
+    return "\n".join(parts).rstrip() + "\n"
+
+
+def create_project(workdir, name):
+    """Copy the framework .claude tree into a fresh synthetic project."""
+    project = os.path.join(workdir, name)
+    shutil.copytree(
+        os.path.join(FRAMEWORK_ROOT, ".claude"),
+        os.path.join(project, ".claude"),
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    os.makedirs(os.path.join(project, "spec_driven_docs", "rough_draft", "bench"))
+    return project
+
+
+def write_corpus(project, documents, subdir="bench"):
+    """Write (name, content) pairs under rough_draft/<subdir>; return paths."""
+    bench_dir = os.path.join(project, "spec_driven_docs", "rough_draft", subdir)
+    paths = []
+    for name, content in documents:
+        path = os.path.join(bench_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        paths.append((path, content))
+    return paths
+
+
+def write_glossary(project, term_count):
+    """Extend the project's terminology config with synthetic terms."""
+    terms = [f"benchterm{i:05d}" for i in range(term_count)]
+
+    rules_path = os.path.join(project, ".claude", "docs", "config", "consistency-rules.json")
+    with open(rules_path) as f:
+        rules = json.load(f)
+    enforced = rules.setdefault("terminology", {}).setdefault("enforced_terms", {})
+    for i, term in enumerate(terms):
+        enforced[term] = [f"benchalias{i:05d}"]
+    with open(rules_path, "w") as f:
+        json.dump(rules, f, indent=2)
+
+    knowledge_path = os.path.join(project, ".claude", "docs", "expertise", "domain-knowledge.json")
+    with open(knowledge_path) as f:
+        knowledge = json.load(f)
+    known = knowledge.setdefault("terminology", {}).setdefault("terms", {})
+    for term in terms:
+        known[term] = f"Synthetic benchmark term {term}"
+    with open(knowledge_path, "w") as f:
+        json.dump(knowledge, f, indent=2)
+
+    return terms
+
+
+def write_suites(project, suite_count, docs_per_suite=10):
+    """Create synthetic suite manifests; return planned output paths."""
+    planned = []
+    for s in range(suite_count):
+        suite_id = f"bench-{s:04d}"
+        documents = []
+        for d in range(docs_per_suite):
+            doc_id = f"{suite_id}-doc-{d:02d}"
+            output_path = f"bench/planned-{s:04d}-{d:02d}.md"
+            planned.append(output_path)
+            documents.append({
+                "doc_id": doc_id,
+                "type": "api",
+                "title": f"Bench suite {s} document {d}",
+                "spec_path": f"specs/docs/{suite_id}/{doc_id}-spec.md",
+                "output_path": output_path,
+                "status": "pending",
+                "quality_score": None,
+                "dependencies": [f"{suite_id}-doc-{d - 1:02d}"] if d else [],
+                "last_modified": None,
+            })
+        manifest = {
+            "suite_id": suite_id,
+            "name": f"Bench suite {s}",
+            "created": "2026-01-01T00:00:00Z",
+            "last_updated": "2026-01-01T00:00:00Z",
+            "configuration": {"parallel_limit": 5, "continue_on_error": True},
+            "documents": documents,
+        }
+        suite_dir = os.path.join(project, ".claude", "docs", "suites", suite_id)
+        os.makedirs(suite_dir, exist_ok=True)
+        with open(os.path.join(suite_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+    return planned
+
+
+# ---------------------------------------------------------------------
+# Process execution
+# ---------------------------------------------------------------------
+
+def run_process(argv, env, cwd):
+    """Run a child process; return (seconds, rc, stdout, peak_rss_kb)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        argv,
+        env=env,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    stdout = proc.stdout.read()
+    proc.stdout.close()
+    # wait4 reaps the child and returns its own rusage, so peak RSS is
+    # per hook process rather than cumulative across the benchmark.
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - start
+    rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return elapsed, proc.returncode, stdout.decode(errors="replace"), rss_kb
+
+
+def run_hook(project, hook, tool_input, tool_result=None):
+    """Invoke a hook the way tests/smoke.sh does; return measurements.
+
+    A call succeeds when the hook exits 0 and any output is JSON. For
+    pre_write the output must also be `"continue": true`, and post_write
+    feedback must not report a consistency issue, so a synthetic corpus
+    that starts tripping a check is reported instead of silently timing
+    a different code path.
+    """
+    env = dict(os.environ)
+    env["CLAUDE_PROJECT_DIR"] = project
+    env["CLAUDE_TOOL_INPUT"] = json.dumps(tool_input)
+    if tool_result is not None:
+        env["CLAUDE_TOOL_RESULT"] = tool_result
+
+    hook_path = os.path.join(project, ".claude", "hooks", HOOKS[hook])
+    start = time.perf_counter()
+    try:
+        elapsed, rc, stdout, rss_kb = run_process([sys.executable, hook_path], env, project)
+    except OSError:
+        return time.perf_counter() - start, False, 0
+
+    if rc != 0:
+        return elapsed, False, rss_kb
+    if not stdout.strip():
+        return elapsed, hook != "pre_write", rss_kb
+    try:
+        result = json.loads(stdout)
+    except json.JSONDecodeError:
+        return elapsed, False, rss_kb
+    if hook == "pre_write" and result.get("continue") is not True:
+        return elapsed, False, rss_kb
+    feedback = result.get("feedback") or ""
+    if hook == "post_write" and any(marker in feedback for marker in POST_WRITE_ISSUE_MARKERS):
+        return elapsed, False, rss_kb
+    return elapsed, True, rss_kb
+
+
+def measure(case_id, hook, dimension, value, project, calls, cases, skipped):
+    """Run each (tool_input, tool_result, input_bytes) call into `cases`.
+
+    The case goes to `skipped` instead when any input is too large to pass
+    in CLAUDE_TOOL_INPUT, the only input channel the hooks are known to
+    read.
+    """
+    largest = max(len(json.dumps(tool_input)) for tool_input, _, _ in calls)
+    if largest > ENV_PAYLOAD_LIMIT:
+        reason = (f"{case_id}: tool input of {largest} bytes exceeds the "
+                  f"{ENV_PAYLOAD_LIMIT}-byte CLAUDE_TOOL_INPUT limit (MAX_ARG_STRLEN)")
+        skipped.append({"dimension": dimension, "reason": reason})
+        return
+
+    latencies = []
+    peak_rss = 0
+    errors = 0
+    input_bytes = 0
+    wall_start = time.perf_counter()
+    for tool_input, tool_result, size in calls:
+        elapsed, ok, rss_kb = run_hook(project, hook, tool_input, tool_result)
+        latencies.append(elapsed)
+        peak_rss = max(peak_rss, rss_kb)
+        errors += 0 if ok else 1
+        input_bytes += size
+    wall = time.perf_counter() - wall_start
+
+    case = {
+        "id": case_id,
+        "hook": hook,
+        "dimension": dimension,
+        "value": value,
+        "runs": len(latencies),
+        "errors": errors,
+        "input_bytes_total": input_bytes,
+        "wall_seconds": round(wall, 4),
+        "throughput_docs_per_sec": round(len(latencies) / wall, 3) if wall else None,
+        "throughput_mb_per_sec": round(input_bytes / wall / 1e6, 3) if wall else None,
+        "latency_ms": summarize(latencies),
+        "peak_rss_kb": peak_rss,
+    }
+    print(f"  {case_id:<40} p50 {case['latency_ms']['p50']:>9.1f} ms  "
+          f"p95 {case['latency_ms']['p95']:>9.1f} ms  "
+          f"rss {peak_rss:>7} KB  errors {errors}")
+    cases.append(case)
+
+
+def write_calls(paths):
+    return [
+        ({"file_path": path, "content": content}, None, len(content.encode()))
+        for path, content in paths
+    ]
+
+
+# ---------------------------------------------------------------------
+# Benchmark dimensions
+# ---------------------------------------------------------------------
+
+def bench_doc_count(workdir, counts, cases, skipped):
+    for count in counts:
+        project = create_project(workdir, f"docs-{count}")
+        paths = write_corpus(project, [
+            (f"doc-{i:05d}.md", make_document(i, BASE_DOC_SIZE)) for i in range(count)
+        ])
+        calls = write_calls(paths)
+        for hook in ("pre_write", "post_write"):
+            measure(f"{hook}/doc_count={count}", hook, "doc_count",
+                    count, project, calls, cases, skipped)
+
+
+def bench_doc_size(workdir, sizes, samples, cases, skipped):
+    for size in sizes:
+        project = create_project(workdir, f"size-{size}")
+        paths = write_corpus(project, [
+            (f"doc-{i:05d}.md", make_document(i, size)) for i in range(samples)
+        ])
+        calls = write_calls(paths)
+        for hook in ("pre_write", "post_write"):
+            measure(f"{hook}/doc_size={size}", hook, "doc_size",
+                    size, project, calls, cases, skipped)
+
+
+def bench_glossary(workdir, term_counts, samples, cases, skipped):
+    for term_count in term_counts:
+        project = create_project(workdir, f"glossary-{term_count}")
+        terms = write_glossary(project, term_count)
+        paths = write_corpus(project, [
+            (f"doc-{i:05d}.md",
+             make_document(i, BASE_DOC_SIZE, terms=terms[i % len(terms):][:5]))
+            for i in range(samples)
+        ])
+        measure(f"post_write/glossary_terms={term_count}", "post_write", "glossary_terms",
+                term_count, project, write_calls(paths), cases, skipped)
+
+
+def bench_links(workdir, link_counts, samples, cases, skipped):
+    for link_count in link_counts:
+        project = create_project(workdir, f"links-{link_count}")
+        # Distinct, existing targets so every link is resolved on disk.
+        write_corpus(project, [
+            (f"targets/t-{t:05d}.md", f"# Target {t}\n") for t in range(link_count)
+        ])
+        links = [(f"Target {t}", f"targets/t-{t:05d}.md") for t in range(link_count)]
+        paths = write_corpus(project, [
+            (f"doc-{i:05d}.md", make_document(i, BASE_DOC_SIZE, links=links))
+            for i in range(samples)
+        ])
+        measure(f"post_write/links_per_doc={link_count}", "post_write", "links_per_doc",
+                link_count, project, write_calls(paths), cases, skipped)
+
+
+def bench_suites(workdir, suite_counts, samples, cases, skipped):
+    for suite_count in suite_counts:
+        project = create_project(workdir, f"suites-{suite_count}")
+        planned = write_suites(project, suite_count)
+        # Like smoke test 5b-i: documents sit at the rough_draft root and
+        # link to output_paths relative to it, so every target resolves to a
+        # planned sibling suggestion rather than a broken link.
+        links = [(f"Planned {p}", p) for p in planned[:10]]
+        paths = write_corpus(project, [
+            (f"doc-{i:05d}.md", make_document(i, BASE_DOC_SIZE, links=links))
+            for i in range(samples)
+        ], subdir="")
+        measure(f"post_write/suites={suite_count}", "post_write", "suites",
+                suite_count, project, write_calls(paths), cases, skipped)
+
+
+def bench_post_review(workdir, samples, cases, skipped):
+    project = create_project(workdir, "post-review")
+    calls = []
+    for i in range(samples):
+        grade = "A" if i % 2 == 0 else "F"
+        score = 95 if grade == "A" else 45
+        rel_path = f"spec_driven_docs/rough_draft/bench/doc-{i:05d}.md"
+        result = (f"Score: {score}/100 ({grade})\n"
+                  f"ready_for_publish: {'true' if grade == 'A' else 'false'}\n"
+                  f"passed: {'true' if grade == 'A' else 'false'}\n"
+                  f"Document: {rel_path}")
+        calls.append(({"command": f"/doc-review {rel_path}"}, result, len(result)))
+    measure("post_review/reviews", "post_review", "reviews",
+            samples, project, calls, cases, skipped)
+
+
+SCHEMA_TIMER = r"""
+import json, sys, time
+from jsonschema import Draft202012Validator
+
+with open(sys.argv[1]) as f:
+    validator = Draft202012Validator(json.load(f))
+timings = []
+errors = 0
+for path in sys.argv[2:]:
+    start = time.perf_counter()
+    with open(path) as f:
+        manifest = json.load(f)
+    if any(True for _ in validator.iter_errors(manifest)):
+        errors += 1
+    timings.append(time.perf_counter() - start)
+print(json.dumps({"timings": timings, "errors": errors}))
+"""
+
+
+def bench_schema(workdir, suite_counts, cases, skipped):
+    """Validate all manifests in one interpreter, as tests/smoke.sh does."""
+    schema_file = os.path.join(FRAMEWORK_ROOT, ".claude", "docs", "config",
+                               "schema", "manifest.schema.json")
+    if not os.path.isfile(schema_file):
+        skipped.append({"dimension": "schema", "reason": f"schema file not found at {schema_file}"})
+        return
+    probe = subprocess.run([sys.executable, "-c", "from jsonschema import Draft202012Validator"],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if probe.returncode != 0:
+        skipped.append({"dimension": "schema",
+                        "reason": "Draft202012Validator not importable; install 'jsonschema>=4.18'"})
+        return
+
+    for suite_count in suite_counts:
+        project = create_project(workdir, f"schema-{suite_count}")
+        write_suites(project, suite_count)
+        suites_dir = os.path.join(project, ".claude", "docs", "suites")
+        manifests = sorted(
+            os.path.join(suites_dir, name, "manifest.json")
+            for name in os.listdir(suites_dir)
+            if os.path.isfile(os.path.join(suites_dir, name, "manifest.json"))
+        )
+        elapsed, rc, stdout, rss_kb = run_process(
+            [sys.executable, "-c", SCHEMA_TIMER, schema_file] + manifests,
+            dict(os.environ), project,
+        )
+        case_id = f"schema/suites={suite_count}"
+        if rc != 0:
+            skipped.append({"dimension": "schema", "reason": f"{case_id}: validator exited {rc}"})
+            continue
+        result = json.loads(stdout)
+        input_bytes = sum(os.path.getsize(path) for path in manifests)
+        case = {
+            "id": case_id,
+            "hook": "schema",
+            "dimension": "suites",
+            "value": suite_count,
+            "runs": len(manifests),
+            "errors": result["errors"],
+            "input_bytes_total": input_bytes,
+            "wall_seconds": round(elapsed, 4),
+            "throughput_docs_per_sec": round(len(manifests) / elapsed, 3),
+            "throughput_mb_per_sec": round(input_bytes / elapsed / 1e6, 3),
+            "latency_ms": summarize(result["timings"]),
+            "peak_rss_kb": rss_kb,
+        }
+        print(f"  {case_id:<40} p50 {case['latency_ms']['p50']:>9.3f} ms  "
+              f"wall {elapsed * 1000:>9.1f} ms  rss {rss_kb:>7} KB  errors {case['errors']}")
+        cases.append(case)
+
+
+# ---------------------------------------------------------------------
+# Compare mode
+# ---------------------------------------------------------------------
+
+def compare(baseline, current, threshold, min_delta_ms, allow_missing=False):
+    """Print a per-case comparison; return the list of regressed case ids."""
+    base_cases = {case["id"]: case for case in baseline.get("cases", [])}
+    regressions = []
+    print("")
+    print("=== Compare ===")
+    print(f"baseline: {baseline.get('git_commit') or 'unknown'} "
+          f"({baseline.get('generated_at', 'unknown')})")
+    print(f"current:  {current.get('git_commit') or 'unknown'} "
+          f"({current.get('generated_at', 'unknown')})")
+    for case in current.get("cases", []):
+        base = base_cases.get(case["id"])
+        if base is None:
+            print(f"  [NEW ] {case['id']}")
+            continue
+        problems = []
+        for stat in ("p50", "p95"):
+            old = base["latency_ms"][stat]
+            new = case["latency_ms"][stat]
+            if new > old * (1 + threshold) and new - old > min_delta_ms:
+                problems.append(f"{stat} {old:.1f} -> {new:.1f} ms")
+        if base.get("peak_rss_kb") and case["peak_rss_kb"] > base["peak_rss_kb"] * (1 + threshold):
+            problems.append(f"rss {base['peak_rss_kb']} -> {case['peak_rss_kb']} KB")
+        if case["errors"] > base["errors"]:
+            problems.append(f"errors {base['errors']} -> {case['errors']}")
+        if problems:
+            regressions.append(case["id"])
+            print(f"  [FAIL] {case['id']}: " + "; ".join(problems))
+        else:
+            delta = case["latency_ms"]["p50"] - base["latency_ms"]["p50"]
+            print(f"  [PASS] {case['id']}: p50 {delta:+.1f} ms")
+    current_ids = {case["id"] for case in current.get("cases", [])}
+    # A case that crashed, was skipped, or was filtered out can hide a
+    # regression, so missing cases fail unless explicitly allowed.
+    for case_id in sorted(set(base_cases) - current_ids):
+        if allow_missing:
+            print(f"  [GONE] {case_id}")
+        else:
+            regressions.append(case_id)
+            print(f"  [FAIL] {case_id}: missing from current run")
+    return regressions
+
+
+# ---------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------
+
+def int_list(text):
+    return [int(item) for item in text.split(",") if item.strip()]
+
+
+def dimension_list(text):
+    names = [item.strip() for item in text.split(",") if item.strip()]
+    unknown = [name for name in names if name not in DIMENSIONS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"invalid dimension(s) {', '.join(unknown) or repr(text)}; "
+            f"choose from {','.join(DIMENSIONS)}"
+        )
+    return names
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "-C", FRAMEWORK_ROOT, "rev-parse", "HEAD"],
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Offline benchmark and scaling harness for the documentation hooks."
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick",
+                        help="Preset scaling sweep (default: quick)")
+    parser.add_argument("--docs", type=int_list, help="Comma-separated document counts")
+    parser.add_argument("--sizes", type=int_list, help="Comma-separated document sizes in bytes")
+    parser.add_argument("--terms", type=int_list, help="Comma-separated glossary sizes")
+    parser.add_argument("--links", type=int_list, help="Comma-separated links per document")
+    parser.add_argument("--suites", type=int_list, help="Comma-separated suite counts")
+    parser.add_argument("--samples", type=int, help="Documents per case for non-count dimensions")
+    parser.add_argument("--only", type=dimension_list,
+                        help="Run only these comma-separated dimensions: " + ",".join(DIMENSIONS))
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="Results file (default: bench_output.txt, git-ignored)")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Compare results against a baseline results file")
+    parser.add_argument("--current", metavar="RESULTS",
+                        help="With --compare, use an existing results file instead of running")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="Relative slowdown that counts as a regression (default: 0.20)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="Ignore latency changes smaller than this (default: 2.0)")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="With --compare, do not fail on baseline cases absent from the run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.current:
+        if not args.compare:
+            print("--current requires --compare", file=sys.stderr)
+            return 2
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        missing = [name for name in HOOKS.values()
+                   if not os.path.isfile(os.path.join(FRAMEWORK_ROOT, ".claude", "hooks", name))]
+        if missing:
+            print(f"hook sources not found under {FRAMEWORK_ROOT}/.claude/hooks: "
+                  + ", ".join(missing), file=sys.stderr)
+            return 2
+
+        profile = dict(PROFILES[args.profile])
+        for key, override in (("doc_counts", args.docs), ("doc_sizes", args.sizes),
+                              ("glossary_terms", args.terms), ("links_per_doc", args.links),
+                              ("suites", args.suites), ("samples", args.samples)):
+            if override is not None:
+                profile[key] = override
+        samples = profile["samples"]
+        selected = set(args.only or DIMENSIONS)
+
+        cases = []
+        skipped = []
+        interrupted = None
+        workdir = tempfile.mkdtemp(prefix="spec-docs-bench-")
+        try:
+            if "doc_count" in selected:
+                print("\n=== Document count ===")
+                bench_doc_count(workdir, profile["doc_counts"], cases, skipped)
+            if "doc_size" in selected:
+                print("\n=== Document size ===")
+                bench_doc_size(workdir, profile["doc_sizes"], samples, cases, skipped)
+            if "glossary" in selected:
+                print("\n=== Glossary size ===")
+                bench_glossary(workdir, profile["glossary_terms"], samples, cases, skipped)
+            if "links" in selected:
+                print("\n=== Link resolution ===")
+                bench_links(workdir, profile["links_per_doc"], samples, cases, skipped)
+            if "suites" in selected:
+                print("\n=== Suites per project ===")
+                bench_suites(workdir, profile["suites"], samples, cases, skipped)
+            if "post_review" in selected:
+                print("\n=== Post-review ===")
+                bench_post_review(workdir, samples, cases, skipped)
+            if "schema" in selected:
+                print("\n=== Manifest schema validation ===")
+                bench_schema(workdir, profile["suites"], cases, skipped)
+        except BaseException as exc:
+            # Keep everything measured so far; the results file is marked
+            # incomplete and the exception is re-raised once it is written.
+            interrupted = exc
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        for entry in skipped:
+            print(f"  [SKIP] {entry['dimension']}: {entry['reason']}")
+
+        current = {
+            "schema_version": SCHEMA_VERSION,
+            "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "profile": args.profile,
+            "parameters": profile,
+            "cases": cases,
+            "skipped": skipped,
+            "incomplete": interrupted is not None,
+        }
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+        print(f"\nResults written to {args.output}")
+        if interrupted is not None:
+            print("Run did not finish; results are partial", file=sys.stderr)
+            raise interrupted
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold, args.min_delta_ms,
+                              args.allow_missing)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) or missing case(s) at {args.threshold:.0%} threshold")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,9 @@
 #   2. JSON Schema validation for suite manifests (requires `jsonschema`;
 #      skipped gracefully if the package is unavailable)
 #   3. Hook execution tests (pre-write blocking, protocol ellipsis allowed)
+#      and batch scheduler tests (dependency order, error handling, resume)
+#      and expertise store tests (exact JSON round-trip, atomic scoring,
+#      indexed lookups, anti-pattern scanner)
 #   4. Codex hook parity (.codex/hooks/*.py byte-match .claude/hooks/*.py;
 #      skipped gracefully when the local-only .codex mirror is absent)
 #   5. Markdown lint (lint:md)
@@ -806,6 +809,593 @@ else
     fail "post-review-hook: silent for non-review command" "$output"
 fi
 
+# ---------------------------------------------------------------------
+# 3c. Batch Scheduler Tests
+# ---------------------------------------------------------------------
+# doc_batch_scheduler.py is exercised against synthetic manifests in a
+# temp directory. S1-S3 inject a thread pool and an in-process task so
+# dispatch order and concurrency are observable; S4-S6 run the CLI as a
+# subprocess (default process pool, suite-id lookup, real hooks).
+section "Batch Scheduler"
+
+run_scheduler_test() {
+    SCHEDULER_DIR="$FRAMEWORK_ROOT/.claude/hooks" python3 - 2>&1
+}
+
+# Test S1: cycles and unknown dependencies are rejected before any work.
+if output=$(run_scheduler_test <<'PY'
+import os, sys
+sys.path.insert(0, os.environ["SCHEDULER_DIR"])
+from doc_batch_scheduler import DependencyCycleError, ManifestError, topological_order
+
+docs = [
+    {"doc_id": "a", "dependencies": []},
+    {"doc_id": "b", "dependencies": ["a", "d"]},
+    {"doc_id": "c", "dependencies": ["b"]},
+    {"doc_id": "d", "dependencies": ["c"]},
+]
+try:
+    topological_order(docs)
+    sys.exit("cycle not detected")
+except DependencyCycleError as e:
+    assert e.cycle == ["b", "d", "c", "b"], e.cycle
+
+try:
+    topological_order([{"doc_id": "a", "dependencies": ["missing"]}])
+    sys.exit("unknown dependency not detected")
+except ManifestError as e:
+    assert "missing" in str(e), e
+
+order = topological_order([
+    {"doc_id": "guide", "dependencies": ["overview"]},
+    {"doc_id": "overview", "dependencies": []},
+    {"doc_id": "ref", "dependencies": ["overview"]},
+])
+assert order == ["overview", "guide", "ref"], order
+PY
+); then
+    pass "scheduler: rejects cycles and unknown dependencies"
+else
+    fail "scheduler: rejects cycles and unknown dependencies" "$output"
+fi
+
+# Test S2: a document is dispatched as soon as its own dependencies finish
+# (not when its level finishes), parallel_limit caps concurrency, and an
+# operation that advances the lifecycle writes status and last_modified.
+if output=$(run_scheduler_test <<'PY'
+import json, os, sys, tempfile, threading, time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.environ["SCHEDULER_DIR"])
+from doc_batch_scheduler import run_batch
+
+delays = {"slow": 0.6, "fast": 0.05, "after-fast": 0.05, "after-slow": 0.05, "other": 0.05}
+manifest = {
+    "suite_id": "sched-test",
+    "configuration": {"parallel_limit": 2, "continue_on_error": False},
+    "documents": [
+        {"doc_id": "slow", "dependencies": [], "status": "pending", "last_modified": None},
+        {"doc_id": "fast", "dependencies": [], "status": "pending", "last_modified": None},
+        {"doc_id": "after-fast", "dependencies": ["fast"], "status": "pending", "last_modified": None},
+        {"doc_id": "after-slow", "dependencies": ["slow"], "status": "pending", "last_modified": None},
+        {"doc_id": "other", "dependencies": ["fast"], "status": "pending", "last_modified": None},
+    ],
+}
+lock = threading.Lock()
+active = [0, 0]
+events = {}
+
+def task(doc):
+    with lock:
+        active[0] += 1
+        active[1] = max(active[1], active[0])
+        events[doc["doc_id"]] = [time.monotonic()]
+    time.sleep(delays[doc["doc_id"]])
+    with lock:
+        active[0] -= 1
+        events[doc["doc_id"]].append(time.monotonic())
+    return True, ""
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "manifest.json")
+    with open(path, "w") as f:
+        json.dump(manifest, f)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        result = run_batch(path, task, "generate", executor=pool,
+                           success_status="completed", log=lambda msg: None)
+    with open(path) as f:
+        saved = json.load(f)
+    leftovers = [n for n in os.listdir(tmp) if n.startswith(".tmp-batch-")]
+
+assert active[1] == 2, f"max concurrency {active[1]}, expected 2"
+assert events["after-fast"][0] < events["slow"][1], "after-fast waited for slow"
+assert sorted(result["completed"]) == sorted(delays), result
+assert all(d["status"] == "completed" and d["last_modified"] for d in saved["documents"]), saved
+assert saved["last_updated"], saved
+assert not leftovers, leftovers
+PY
+); then
+    pass "scheduler: dispatches when dependencies finish, capped by parallel_limit"
+else
+    fail "scheduler: dispatches when dependencies finish, capped by parallel_limit" "$output"
+fi
+
+# Test S3: continue_on_error skips only the failed document's descendants.
+# Progress goes to .batch-state.json, never to the lifecycle status, and a
+# rerun of the same operation resumes without repeating work.
+if output=$(run_scheduler_test <<'PY'
+import json, os, sys, tempfile
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.environ["SCHEDULER_DIR"])
+from doc_batch_scheduler import run_batch
+
+manifest = {
+    "suite_id": "sched-test",
+    "configuration": {"parallel_limit": 3, "continue_on_error": True},
+    "documents": [
+        {"doc_id": "base", "dependencies": [], "status": "completed", "last_modified": None},
+        {"doc_id": "broken", "dependencies": ["base"], "status": "review", "last_modified": None},
+        {"doc_id": "child", "dependencies": ["broken"], "status": "writing", "last_modified": None},
+        {"doc_id": "grandchild", "dependencies": ["child", "base"], "status": "pending", "last_modified": None},
+        {"doc_id": "sibling", "dependencies": ["base"], "status": "review", "last_modified": None},
+    ],
+}
+calls = []
+failing = {"broken"}
+
+def task(doc):
+    calls.append(doc["doc_id"])
+    return doc["doc_id"] not in failing, "synthetic failure"
+
+def run(path, **kwargs):
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        return run_batch(path, task, "validate", executor=pool, log=lambda msg: None, **kwargs)
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "manifest.json")
+    with open(path, "w") as f:
+        json.dump(manifest, f)
+    with open(path) as f:
+        original = f.read()
+
+    # Completed documents are still checked: status is not batch progress.
+    result = run(path)
+    assert "base" in calls, calls
+    assert result["failed"] == ["broken"], result
+    assert result["skipped"] == ["child", "grandchild"], result
+    assert sorted(result["completed"]) == ["base", "sibling"], result
+    assert "child" not in calls and "grandchild" not in calls, calls
+    with open(path) as f:
+        assert f.read() == original, "validate rewrote the manifest"
+    with open(os.path.join(tmp, ".batch-state.json")) as f:
+        state = json.load(f)
+    assert sorted(state["validate"]["completed"]) == ["base", "sibling"], state
+    assert state["validate"]["finished"] is None, state
+    first_run = result["run_id"]
+
+    # Resume after fixing the failure: only unfinished documents run.
+    calls.clear()
+    failing.clear()
+    result = run(path)
+    assert result["run_id"] == first_run, result
+    assert sorted(calls) == ["broken", "child", "grandchild"], calls
+    assert result["resumed"] == ["base", "sibling"], result
+    with open(os.path.join(tmp, ".batch-state.json")) as f:
+        assert json.load(f)["validate"]["finished"], "finished run not marked"
+
+    # A finished run is not resumed; without continue_on_error nothing new
+    # is dispatched after a failure.
+    calls.clear()
+    failing.add("base")
+    result = run(path, parallel_limit=1, continue_on_error=False)
+    assert result["run_id"] != first_run, result
+    assert calls == ["base"], calls
+    assert result["not_run"] == ["broken", "child", "grandchild", "sibling"], result
+    with open(path) as f:
+        assert f.read() == original, "validate rewrote the manifest"
+PY
+); then
+    pass "scheduler: continue_on_error skips descendants and resumes"
+else
+    fail "scheduler: continue_on_error skips descendants and resumes" "$output"
+fi
+
+# Test S4: dry run weights the critical path and makespan by per-document
+# estimate_seconds (falling back to --estimate) without touching the manifest.
+sched_tmp=$(mktemp -d)
+python3 - "$sched_tmp/manifest.json" <<'PY'
+import json, sys
+
+docs = [{"doc_id": "overview", "dependencies": []}]
+docs += [{"doc_id": f"guide-{i}", "dependencies": ["overview"]} for i in range(3)]
+docs += [{"doc_id": "reference", "dependencies": ["guide-0"]}]
+docs[2]["estimate_seconds"] = 5
+for doc in docs:
+    doc.update({"status": "pending", "last_modified": None})
+with open(sys.argv[1], "w") as f:
+    json.dump({"suite_id": "sched-dry-run",
+               "configuration": {"parallel_limit": 2, "continue_on_error": False},
+               "documents": docs}, f)
+PY
+before=$(cat "$sched_tmp/manifest.json")
+output=$(python3 .claude/hooks/doc_batch_scheduler.py "$sched_tmp/manifest.json" --dry-run 2>&1)
+rc=$?
+after=$(cat "$sched_tmp/manifest.json")
+rm -rf "$sched_tmp"
+if [ $rc -eq 0 ] && [ "$before" = "$after" ] \
+    && echo "$output" | grep -q "Critical path (6.0s): overview -> guide-1" \
+    && echo "$output" | grep -q "Expected makespan: 6.0s (level batching: 8.0s, serial: 9.0s)"; then
+    pass "scheduler: dry run reports weighted critical path and makespan"
+else
+    fail "scheduler: dry run reports weighted critical path and makespan" "$output"
+fi
+
+# Test S5: CLI validate by suite id against a temp project using the real
+# hooks on the default process pool. A broken link fails its document and
+# skips its dependent, the exit code is 1, and the manifest (including
+# lifecycle status) is left unchanged. A cyclic suite exits 2.
+sched_project=$(mktemp -d)
+cp -r "$FRAMEWORK_ROOT/.claude" "$sched_project/.claude"
+find "$sched_project/.claude/docs/suites" -mindepth 1 -maxdepth 1 -exec rm -rf {} +
+python3 - "$sched_project" <<'PY'
+import json, os, sys
+
+project = sys.argv[1]
+docs_dir = os.path.join(project, "spec_driven_docs", "rough_draft", "sched")
+os.makedirs(docs_dir)
+clean = """# Sample Document
+
+This document exists only to exercise the batch scheduler during smoke
+tests. It has enough prose to avoid length warnings and uses no forbidden
+terminology, so the post-write hook should report no consistency issues.
+"""
+broken = """# Release Notes
+
+This document references a file that does not exist anywhere in the project
+and is not declared in any suite manifest. The post-write hook must report it
+as a genuine broken link so the scheduler fails this document and skips its
+dependents. Extra prose keeps the document above the minimum word count.
+
+See [Missing](nonexistent-doc.md) for details that were never written.
+"""
+for name, content in (("clean.md", clean), ("broken.md", broken), ("child.md", clean)):
+    with open(os.path.join(docs_dir, name), "w") as f:
+        f.write(content)
+
+def doc(doc_id, status, deps):
+    return {"doc_id": doc_id, "type": "manual", "title": doc_id,
+            "spec_path": f"specs/docs/sched/{doc_id}-spec.md",
+            "output_path": f"spec_driven_docs/rough_draft/sched/{doc_id}.md",
+            "status": status, "quality_score": None, "dependencies": deps,
+            "last_modified": None}
+
+suites = os.path.join(project, ".claude", "docs", "suites")
+for suite_id, documents in (
+    ("sched-smoke", [doc("clean", "review", []), doc("broken", "writing", []),
+                     doc("child", "pending", ["broken"])]),
+    ("sched-cycle", [doc("clean", "review", ["child"]), doc("child", "pending", ["clean"])]),
+):
+    os.makedirs(os.path.join(suites, suite_id))
+    with open(os.path.join(suites, suite_id, "manifest.json"), "w") as f:
+        json.dump({"suite_id": suite_id, "name": suite_id,
+                   "created": "2026-01-01T00:00:00Z", "last_updated": "2026-01-01T00:00:00Z",
+                   "configuration": {"parallel_limit": 2, "continue_on_error": True},
+                   "documents": documents}, f, indent=2)
+PY
+sched_manifest="$sched_project/.claude/docs/suites/sched-smoke/manifest.json"
+before=$(cat "$sched_manifest")
+output=$(cd "$sched_project" && CLAUDE_PROJECT_DIR="$sched_project" \
+    python3 .claude/hooks/doc_batch_scheduler.py sched-smoke --operation validate 2>&1)
+rc=$?
+after=$(cat "$sched_manifest")
+if [ $rc -eq 1 ] && [ "$before" = "$after" ] \
+    && echo "$output" | grep -q "\[DONE \] clean" \
+    && echo "$output" | grep -q "\[FAIL \] broken: doc_post_write.py: .*Broken link" \
+    && echo "$output" | grep -q "\[SKIP \] child: depends on failed broken" \
+    && python3 -c "
+import json, sys
+state = json.load(open(sys.argv[1]))['validate']
+sys.exit(0 if sorted(state['completed']) == ['clean'] and not state['finished'] else 1)
+" "$(dirname "$sched_manifest")/.batch-state.json"; then
+    pass "scheduler: CLI validate fails broken links and keeps manifest status"
+else
+    fail "scheduler: CLI validate fails broken links and keeps manifest status" "rc=$rc $output"
+fi
+
+output=$(cd "$sched_project" && CLAUDE_PROJECT_DIR="$sched_project" \
+    python3 .claude/hooks/doc_batch_scheduler.py sched-cycle 2>&1)
+rc=$?
+if [ $rc -eq 2 ] && echo "$output" | grep -q "Dependency cycle"; then
+    pass "scheduler: CLI exits 2 on a dependency cycle"
+else
+    fail "scheduler: CLI exits 2 on a dependency cycle" "rc=$rc $output"
+fi
+
+# Test S6: CLI lint runs markdownlint per document (skipped when the
+# markdownlint dev dependency is not installed).
+if [ -d node_modules ] && npx --no-install markdownlint --version >/dev/null 2>&1; then
+    ln -s "$FRAMEWORK_ROOT/node_modules" "$sched_project/node_modules"
+    output=$(cd "$sched_project" && CLAUDE_PROJECT_DIR="$sched_project" \
+        python3 .claude/hooks/doc_batch_scheduler.py sched-smoke --operation lint 2>&1)
+    rc=$?
+    if [ $rc -eq 0 ] && [ "$before" = "$(cat "$sched_manifest")" ]; then
+        pass "scheduler: CLI lint passes clean documents"
+    else
+        fail "scheduler: CLI lint passes clean documents" "rc=$rc $output"
+    fi
+else
+    echo "  [SKIP] scheduler: lint (markdownlint not installed; run 'npm install')"
+fi
+rm -rf "$sched_project"
+
+# ---------------------------------------------------------------------
+# 3d. Expertise Store Tests
+# ---------------------------------------------------------------------
+# doc_expertise_store.py is exercised against synthetic patterns.json and
+# anti-patterns.json files in a temp directory; the real expertise files
+# are never touched. E1-E4 call the module in-process, E5 runs the CLI.
+section "Expertise Store"
+
+run_store_test() {
+    STORE_DIR="$FRAMEWORK_ROOT/.claude/hooks" python3 - "$@" 2>&1
+}
+
+# Test E1: import/export round-trips byte for byte (key order, "0.90"
+# literals, indentation, top-level shape) and rewrites only changed counters.
+if output=$(run_store_test <<'PY'
+import json, os, sys, tempfile
+sys.path.insert(0, os.environ["STORE_DIR"])
+from doc_expertise_store import ExpertiseError, connect, export_file, import_file, record_use
+
+patterns = """{
+  "version": "1.0",
+  "patterns": [
+    {
+      "id": "api-error-documentation",
+      "category": "api-documentation",
+      "description": "Document error responses – with recovery steps",
+      "effectiveness_score": 0.90,
+      "usage_count": 15,
+      "example": "Include error code, message, and steps to resolve",
+      "source_document": "docs/api/auth.md"
+    },
+    {
+      "id": "decision-record",
+      "category": "design-documentation",
+      "description": "ADR format for design docs",
+      "effectiveness_score": 0.92,
+      "usage_count": 4
+    }
+  ],
+  "metadata": {}
+}
+"""
+anti_patterns = [{"id": "wall-of-text", "category": "structure", "description": "Long paragraphs",
+                  "detection_pattern": "[^\\n]{400,}", "severity": "warning",
+                  "correction": "Use lists", "occurrence_count": 2}]
+with tempfile.TemporaryDirectory() as tmp:
+    conn = connect(os.path.join(tmp, "expertise.db"))
+    files = {"patterns": (os.path.join(tmp, "patterns.json"), patterns),
+             "anti-patterns": (os.path.join(tmp, "anti-patterns.json"),
+                               json.dumps(anti_patterns, indent=4))}
+    for kind, (path, text) in files.items():
+        with open(path, "w") as f:
+            f.write(text)
+        import_file(conn, kind, path)
+        export_file(conn, kind, path)
+        assert open(path).read() == text, kind
+
+    assert record_use(conn, "decision-record", True) == 0.94
+    try:
+        import_file(conn, "patterns", files["patterns"][0])
+        sys.exit("import discarded unexported updates")
+    except ExpertiseError:
+        pass
+    export_file(conn, "patterns", files["patterns"][0])
+    expected = patterns.replace('0.92,\n      "usage_count": 4', '0.94,\n      "usage_count": 5')
+    assert open(files["patterns"][0]).read() == expected, open(files["patterns"][0]).read()
+
+    with open(files["patterns"][0], "w") as f:
+        f.write('{"patterns": [{"id": "a"}],  "version": 1}\n')
+    try:
+        import_file(conn, "patterns", files["patterns"][0])
+        sys.exit("irreproducible layout accepted")
+    except ExpertiseError as e:
+        assert "layout" in str(e), e
+PY
+); then
+    pass "expertise-store: JSON round-trips exactly and keeps literals"
+else
+    fail "expertise-store: JSON round-trips exactly and keeps literals" "$output"
+fi
+
+# Test E2: concurrent writers never lose a score update, and scores are
+# clamped to 0.50-0.99.
+if output=$(run_store_test <<'PY'
+import json, os, sys, tempfile
+from multiprocessing import Pool
+sys.path.insert(0, os.environ["STORE_DIR"])
+from doc_expertise_store import connect, import_file, record_use
+
+def use(args):
+    db_path, pattern_id, success, times = args
+    conn = connect(db_path)
+    for _ in range(times):
+        record_use(conn, pattern_id, success)
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "expertise.db")
+        path = os.path.join(tmp, "patterns.json")
+        with open(path, "w") as f:
+            json.dump({"patterns": [
+                {"id": "shared", "category": "api", "effectiveness_score": 0.55, "usage_count": 0},
+                {"id": "high", "category": "api", "effectiveness_score": 0.97, "usage_count": 0},
+                {"id": "low", "category": "api", "effectiveness_score": 0.60, "usage_count": 0},
+            ]}, f, indent=2)
+        import_file(connect(db_path), "patterns", path)
+        with Pool(8) as pool:
+            pool.map(use, [(db_path, "shared", True, 2)] * 8
+                     + [(db_path, "high", True, 5), (db_path, "low", False, 5)])
+        rows = dict((r[0], r[1:]) for r in connect(db_path).execute(
+            "SELECT id, effectiveness_score, usage_count FROM entries"))
+        assert rows["shared"] == (0.87, 16), rows
+        assert rows["high"] == (0.99, 5), rows
+        assert rows["low"] == (0.5, 5), rows
+PY
+); then
+    pass "expertise-store: concurrent score updates are atomic and clamped"
+else
+    fail "expertise-store: concurrent score updates are atomic and clamped" "$output"
+fi
+
+# Test E3: top-N lookup by document type uses the index and includes
+# general patterns, most effective first.
+if output=$(run_store_test <<'PY'
+import json, os, sys, tempfile
+sys.path.insert(0, os.environ["STORE_DIR"])
+from doc_expertise_store import connect, doc_type_for, import_file, top_patterns
+
+assert doc_type_for({"category": "api-documentation"}) == "api"
+assert doc_type_for({"category": "architecture"}) == "design"
+assert doc_type_for({"category": "user-guide"}) == "manual"
+assert doc_type_for({"category": "structure"}) == ""
+assert doc_type_for({"category": "api", "doc_type": "manual"}) == "manual"
+
+entries = [{"id": f"{category}-{i}", "category": category,
+            "effectiveness_score": round(0.50 + (i * 7 % 50) / 100, 2), "usage_count": i}
+           for category in ("api-documentation", "design-documentation", "structure")
+           for i in range(200)]
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "patterns.json")
+    with open(path, "w") as f:
+        json.dump(entries, f, indent=2)
+    conn = connect(os.path.join(tmp, "expertise.db"))
+    import_file(conn, "patterns", path)
+    top = top_patterns(conn, "api", 5)
+    expected = sorted((e for e in entries if not e["category"].startswith("design")),
+                      key=lambda e: (-e["effectiveness_score"], -e["usage_count"]))[:5]
+    assert [p["id"] for p in top] == [e["id"] for e in expected], [p["id"] for p in top]
+    plan = " ".join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT body FROM entries "
+        "WHERE kind = 'patterns' AND doc_type IN ('api', '')"))
+    assert "entries_by_doc_type" in plan, plan
+    plan = " ".join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT body FROM entries "
+        "WHERE kind = 'patterns' AND category = 'structure'"))
+    assert "entries_by_category" in plan, plan
+PY
+); then
+    pass "expertise-store: top-N patterns per doc type via index"
+else
+    fail "expertise-store: top-N patterns per doc type via index" "$output"
+fi
+
+# Test E4: the combined anti-pattern scanner reports exactly what running
+# each detection_pattern with re.finditer would, including overlapping
+# detectors and ones that cannot be combined; invalid regexes are skipped.
+if output=$(run_store_test <<'PY'
+import os, random, re, sys
+sys.path.insert(0, os.environ["STORE_DIR"])
+from doc_expertise_store import AntiPatternScanner
+
+detectors = [r"the value", r"value", r"(?i)todo", r"\b(\w+) \1\b", r"(?P<w>foo)bar",
+             r"a+", r"aa", r"(?<=x)y+", r"(?m)^#{4,}", r"e\w*?s", r"(?x) f o o", r"[unclosed"]
+entries = [{"id": f"ap-{i}", "detection_pattern": p, "severity": "warning"}
+           for i, p in enumerate(detectors)]
+scanner = AntiPatternScanner(entries)
+assert [s[0] for s in scanner.skipped] == ["ap-11"], scanner.skipped
+
+random.seed(7)
+pieces = ["the value", "value", "TODO", "aaaa", "xyy", "foobar", "the the", "#####",
+          "\n", " ", "ess", "e", "foo"]
+for _ in range(500):
+    text = "".join(random.choice(pieces) for _ in range(random.randint(0, 40)))
+    found = sorted((f["id"], f["match"]) for f in scanner.scan(text))
+    expected = sorted((e["id"], m.group()) for e in entries[:-1]
+                      for m in re.finditer(e["detection_pattern"], text))
+    assert found == expected, (text, found, expected)
+
+findings = scanner.scan("# Title\n\nSet the value here.\n")
+assert [(f["id"], f["line"]) for f in findings] == [("ap-0", 3), ("ap-1", 3), ("ap-5", 3)], findings
+PY
+); then
+    pass "expertise-store: one-pass anti-pattern scanner matches per-regex scan"
+else
+    fail "expertise-store: one-pass anti-pattern scanner matches per-regex scan" "$output"
+fi
+
+# Test E5: CLI import, top, record, scan --record and export against a
+# temp project; export refuses to overwrite a file edited since import.
+store_project=$(mktemp -d)
+mkdir -p "$store_project/.claude/docs/expertise"
+cp -R "$FRAMEWORK_ROOT/.claude/hooks" "$store_project/.claude/hooks"
+run_store_test "$store_project" <<'PY' >/dev/null
+import json, os, sys
+expertise = os.path.join(sys.argv[1], ".claude", "docs", "expertise")
+with open(os.path.join(expertise, "patterns.json"), "w") as f:
+    json.dump({"patterns": [
+        {"id": "code-example-pairs", "category": "api-documentation", "description": "Request/response pairs",
+         "effectiveness_score": 0.95, "usage_count": 20},
+        {"id": "decision-record", "category": "design-documentation", "description": "ADR format",
+         "effectiveness_score": 0.97, "usage_count": 2},
+    ]}, f, indent=2)
+    f.write("\n")
+with open(os.path.join(expertise, "anti-patterns.json"), "w") as f:
+    json.dump({"anti_patterns": [
+        {"id": "vague-parameter-description", "category": "api-documentation",
+         "description": "Parameter described only as 'the value'",
+         "detection_pattern": "(?i)\\bthe value\\b", "severity": "warning",
+         "correction": "Describe type, constraints and purpose", "occurrence_count": 8},
+    ]}, f, indent=2)
+    f.write("\n")
+with open(os.path.join(sys.argv[1], "doc.md"), "w") as f:
+    f.write("# Limits\n\nSet `limit` to the value you need.\n")
+PY
+store() {
+    (cd "$store_project" && CLAUDE_PROJECT_DIR="$store_project" \
+        python3 .claude/hooks/doc_expertise_store.py "$@" 2>&1)
+}
+anti_before=$(cat "$store_project/.claude/docs/expertise/anti-patterns.json")
+import_out=$(store import)
+import_rc=$?
+top_out=$(store top api -n 1 --json)
+record_out=$(store record code-example-pairs --failure)
+scan_out=$(store scan doc.md --doc-type api --record)
+scan_rc=$?
+export_out=$(store export)
+export_rc=$?
+if [ $import_rc -eq 0 ] && [ $scan_rc -eq 1 ] && [ $export_rc -eq 0 ] \
+    && echo "$top_out" | grep -q '"id": "code-example-pairs"' \
+    && echo "$record_out" | grep -q "code-example-pairs: effectiveness_score 0.90" \
+    && echo "$scan_out" | grep -q "\[warning\] vague-parameter-description line 3" \
+    && python3 -c "
+import json, sys
+patterns = json.load(open(sys.argv[1]))['patterns']
+anti = json.load(open(sys.argv[2]))['anti_patterns']
+sys.exit(0 if patterns[0]['effectiveness_score'] == 0.90 and patterns[0]['usage_count'] == 21
+         and anti[0]['occurrence_count'] == 9 else 1)
+" "$store_project/.claude/docs/expertise/patterns.json" \
+  "$store_project/.claude/docs/expertise/anti-patterns.json" \
+    && [ "$anti_before" = "$(sed 's/"occurrence_count": 9/"occurrence_count": 8/' \
+        "$store_project/.claude/docs/expertise/anti-patterns.json")" ]; then
+    pass "expertise-store: CLI import, top, record, scan and export"
+else
+    fail "expertise-store: CLI import, top, record, scan and export" \
+        "import=$import_rc scan=$scan_rc export=$export_rc $import_out $top_out $record_out $scan_out $export_out"
+fi
+
+echo '{"patterns": []}' > "$store_project/.claude/docs/expertise/patterns.json"
+store record decision-record --success >/dev/null
+output=$(store export)
+rc=$?
+if [ $rc -eq 2 ] && echo "$output" | grep -q "changed since it was imported" \
+    && [ "$(cat "$store_project/.claude/docs/expertise/patterns.json")" = '{"patterns": []}' ]; then
+    pass "expertise-store: export refuses to overwrite edited JSON"
+else
+    fail "expertise-store: export refuses to overwrite edited JSON" "rc=$rc $output"
+fi
+rm -rf "$store_project"
+
 # ---------------------------------------------------------------------
 # 4. Codex Hook Parity
 # ---------------------------------------------------------------------